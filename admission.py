@@ -0,0 +1,151 @@
+"""
+House Price Predictor - Admission Control
+Per-client row quotas, request size caps and load shedding for the prediction API
+"""
+# admission.py
+import math
+import os
+import threading
+import time
+
+# Each client gets a token bucket measured in rows: it refills at
+# RATE_LIMIT_ROWS_PER_SEC and holds at most RATE_LIMIT_BURST_ROWS.
+RATE_LIMIT_ROWS_PER_SEC = float(os.environ.get("RATE_LIMIT_ROWS_PER_SEC", 200))
+RATE_LIMIT_BURST_ROWS = float(os.environ.get("RATE_LIMIT_BURST_ROWS", 2000))
+MAX_ROWS_PER_REQUEST = int(os.environ.get("MAX_ROWS_PER_REQUEST", 1000))
+# Requests running or waiting for a thread in one gunicorn worker before new
+# ones are shed with 429; by default four per worker thread
+MAX_QUEUE_DEPTH = int(os.environ.get("MAX_QUEUE_DEPTH", 4 * int(os.environ.get("GUNICORN_THREADS", 2))))
+# redis://... to share quotas across gunicorn workers
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")
+
+SHED_RETRY_AFTER = 1  # seconds
+
+
+class Rejected(Exception):
+    """Raised when a request is refused; carries the HTTP status and Retry-After"""
+
+    def __init__(self, message, status=429, retry_after=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.retry_after = retry_after
+
+
+class MemoryStore:
+    """Token buckets kept in this process"""
+
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}  # client -> (tokens, last refill time)
+
+    def take(self, key, cost, rate, capacity, now=None):
+        """Take ``cost`` tokens; return 0 if admitted, else seconds until they are available"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (cost - tokens) / rate
+
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._prune(now, rate, capacity)
+        return wait
+
+    def _prune(self, now, rate, capacity):
+        # A bucket that has refilled completely is the same as a missing one
+        self._buckets = {
+            key: (tokens, last) for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * rate < capacity
+        }
+
+
+class RedisStore:
+    """Token buckets shared through Redis (or a compatible server)"""
+
+    TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or tonumber(ARGV[4])
+    tokens = math.min(capacity, tokens + (tonumber(ARGV[4]) - last) * tonumber(ARGV[2]))
+    local wait = 0
+    if tokens >= tonumber(ARGV[1]) then
+        tokens = tokens - tonumber(ARGV[1])
+    else
+        wait = (tonumber(ARGV[1]) - tokens) / tonumber(ARGV[2])
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', ARGV[4])
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / tonumber(ARGV[2])) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url, prefix="houseprice:"):
+        import redis  # optional dependency, only needed for shared quotas
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._take = self._client.register_script(self.TAKE_SCRIPT)
+
+    def take(self, key, cost, rate, capacity, now=None):
+        now = time.time() if now is None else now
+        wait = self._take(keys=[f"{self._prefix}bucket:{key}"], args=[cost, rate, capacity, now])
+        return float(wait)
+
+
+def create_store(redis_url=RATE_LIMIT_REDIS_URL):
+    """Use Redis when configured, otherwise a process-local store"""
+    if redis_url:
+        return RedisStore(redis_url)
+    return MemoryStore()
+
+
+store = create_store()
+
+# The scoring queue is per worker process: the requests it is scoring, plus
+# those it has accepted that are still waiting for a free thread. The app never
+# sees the waiting ones, so gunicorn.conf.py's worker class counts them. Kept
+# in memory, the count disappears with the worker instead of leaking.
+_running = 0
+_waiting = 0
+_queue_lock = threading.Lock()
+
+
+def request_waiting(change):
+    """Called by the gunicorn worker: +1 when a request is queued for a thread, -1 when one picks it up"""
+    global _waiting
+    with _queue_lock:
+        _waiting = max(0, _waiting + change)
+
+
+def acquire_slot(limit=MAX_QUEUE_DEPTH):
+    """Reserve a place in this worker's scoring queue or shed the request with 429"""
+    global _running
+    with _queue_lock:
+        if _running + _waiting >= limit:
+            raise Rejected("Server is busy, please retry shortly", retry_after=SHED_RETRY_AFTER)
+        _running += 1
+
+
+def release_slot():
+    global _running
+    with _queue_lock:
+        _running = max(0, _running - 1)
+
+
+def check_quota(client, rows, max_rows=MAX_ROWS_PER_REQUEST,
+                rate=RATE_LIMIT_ROWS_PER_SEC, burst=RATE_LIMIT_BURST_ROWS):
+    """Reject oversized requests (413) and clients that are over their row quota (429)"""
+    if rows > max_rows:
+        raise Rejected(f"Too many rows: {rows} (maximum is {max_rows} per request)", status=413)
+
+    # A request that is allowed must also fit in a full bucket
+    wait = store.take(client, rows, rate, max(burst, max_rows))
+    if wait > 0:
+        raise Rejected("Rate limit exceeded", retry_after=math.ceil(wait))
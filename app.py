@@ -2,20 +2,50 @@
 House Price Predictor - Flask API Server
 Enhanced Indian Housing Model with Location-based Pricing
 """
-import pickle
-import pandas as pd
+import os
 from flask_cors import CORS
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
+import jobs
+from admission import Rejected, acquire_slot, check_quota, release_slot
+from responses import (
+    ARROW_STREAM, COLUMNAR_JSON, FLOAT64_BINARY, RESPONSE_FORMATS, ROW_JSON,
+    arrow_stream, columnar_json, float64_binary,
+)
+from scoring import InvalidInput, format_price, get_model_state, predict_prices
 
 app = Flask(__name__)
 
+# Behind a reverse proxy, set PROXY_FIX_X_FOR to the number of proxies in front
+# of the app so request.remote_addr is the real client, taken from the
+# X-Forwarded-For entries those proxies appended (not from client-supplied ones)
+PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+if PROXY_FIX_X_FOR:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_FIX_X_FOR)
+
+# Load the model once at import time. Under gunicorn with preload_app this
+# happens in the master, and forked workers share it copy-on-write.
+get_model_state()
+
+# Start the job broker (and resume unfinished jobs) with the app. Under
+# gunicorn the master must not run jobs; gunicorn.conf.py starts it in
+# every worker instead.
+if not os.environ.get("SERVER_SOFTWARE", "").startswith("gunicorn"):
+    jobs.get_broker()
+
+# Uploads larger than this are rejected with 413 before they are read
+app.config["MAX_CONTENT_LENGTH"] = jobs.JOB_MAX_UPLOAD_MB * 2**20
+
 # Allow only your frontend domain (and local dev)
 CORS(app, resources={
     r"/*": {
         "origins": [
             "http://localhost:5173",  # local dev
             "https://house-price-predictor-snowy.vercel.app"  # deployed frontend
-        ]
+        ],
+        # Let browser clients read the row count of binary responses and when to retry
+        "expose_headers": ["X-Rows", "Retry-After"],
     }
 })
 
@@ -26,55 +56,85 @@ def home():
     return jsonify({"status": "Backend is alive 🚀"})
 #--------------------------------------
 
+@app.errorhandler(Rejected)
+def rejected(error):
+    response = jsonify({"error": error.message})
+    response.status_code = error.status
+    if error.retry_after is not None:
+        response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def too_large(error):
+    return jsonify({"error": f"Request body too large (maximum is {jobs.JOB_MAX_UPLOAD_MB} MB)"}), 413
+
+
+@app.errorhandler(InvalidInput)
+def invalid_input(error):
+    # Unknown cities/localities and mismatched columns are the client's fault, not a 500
+    return jsonify({"error": str(error)}), 400
+
+
+def client_id():
+    """Identify the caller by its address (see PROXY_FIX_X_FOR when behind a proxy)"""
+    return request.remote_addr
+
+
 @app.route("/api/predict/", methods=["POST", "OPTIONS"])
 def index():
     # Handle preflight request (CORS)
     if request.method == "OPTIONS":
         return "", 200
 
+    # Shed load before even parsing the body when too much is queued
+    acquire_slot()
+    try:
+        return predict()
+    finally:
+        release_slot()
+
+
+def predict():
+    # Large batches can ask for a columnar encoding built straight from the array.
+    # A client that only accepts formats we cannot produce (e.g. Arrow without
+    # pyarrow installed) gets 406 rather than a body it cannot read.
+    response_format = request.accept_mimetypes.best_match(RESPONSE_FORMATS)
+    if response_format is None:
+        if request.accept_mimetypes:
+            return jsonify({"error": "Not acceptable", "available": RESPONSE_FORMATS}), 406
+        response_format = ROW_JSON
+
     data = request.json
     sizes = data["sizes"]
     bedrooms = data["bedrooms"]
     cities = data.get("cities", ["Delhi"] * len(sizes))  # Default to Delhi if not provided
 
-    # Load model
-    with open("model.pkl", "rb") as f:
-        model = pickle.load(f)
+    # Quotas are counted in rows, so one huge batch costs as much as many small ones
+    check_quota(client_id(), len(sizes))
 
-    try:
-        # Try loading city encoder
-        with open("city_encoder.pkl", "rb") as f:
-            city_encoder = pickle.load(f)
-
-        # Encode cities
-        city_encoded = city_encoder.transform(cities)
-
-        new_data = pd.DataFrame({
-            "sizes": sizes,
-            "bedrooms": bedrooms,
-            "city_encoded": city_encoded
-        })
-    except FileNotFoundError:
-        # Fallback: model without city encoding
-        new_data = pd.DataFrame({"sizes": sizes, "bedrooms": bedrooms})
-
-    # Predict prices
-    prices = model.predict(new_data).tolist()
-    results = []
+    # Optional finer-grained location: per-row coordinates or locality names
+    latitudes = data.get("latitudes")
+    longitudes = data.get("longitudes")
+    localities = data.get("localities")
 
-    for i, (size, bedroom, price) in enumerate(zip(sizes, bedrooms, prices)):
-        # Format price in Indian Rupees
-        if price >= 10000000:  # 1 Crore or more
-            formatted_price = f"₹{price/10000000:.2f} Cr"
-        elif price >= 100000:  # 1 Lakh or more
-            formatted_price = f"₹{price/100000:.2f} L"
-        else:
-            formatted_price = f"₹{price:,.0f}"
+    # Predict prices using the model loaded at startup
+    prices = predict_prices(sizes, bedrooms, cities, latitudes, longitudes, localities)
 
+    if response_format == COLUMNAR_JSON:
+        return Response(columnar_json(sizes, bedrooms, cities, prices), mimetype=COLUMNAR_JSON)
+    if response_format == ARROW_STREAM:
+        return Response(arrow_stream(sizes, bedrooms, cities, prices), mimetype=ARROW_STREAM)
+    if response_format == FLOAT64_BINARY:
+        return Response(float64_binary(prices), mimetype=FLOAT64_BINARY, headers={"X-Rows": str(len(prices))})
+
+    results = []
+
+    for i, (size, bedroom, price) in enumerate(zip(sizes, bedrooms, prices.tolist())):
         result = {
             "size": size,
             "bedroom": bedroom,
-            "predicted_price": formatted_price,
+            "predicted_price": format_price(price),
             "predicted_price_raw": int(price)  # Raw numeric value
         }
 
@@ -85,3 +145,57 @@ def index():
         results.append(result)
 
     return jsonify({"message": "Prediction results", "results": results})
+
+
+@app.route("/api/jobs/", methods=["POST"])
+def create_job():
+    # Large revaluations: upload a CSV with sizes, bedrooms and (optionally) cities
+    if jobs.active_jobs(client_id()) >= jobs.JOB_MAX_ACTIVE_PER_CLIENT:
+        raise Rejected(
+            f"Too many unfinished jobs (maximum is {jobs.JOB_MAX_ACTIVE_PER_CLIENT} per client)", retry_after=30
+        )
+
+    # Receiving and checking an upload ties up a thread like a prediction does
+    acquire_slot()
+    try:
+        upload = request.files.get("file")
+        if upload is None:
+            return jsonify({"error": "Upload a CSV file in the 'file' field"}), 400
+
+        try:
+            job_id = jobs.create_job(upload, client_id())
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+    finally:
+        release_slot()
+
+    return jsonify({
+        "job_id": job_id,
+        "status_url": f"/api/jobs/{job_id}/",
+        "result_url": f"/api/jobs/{job_id}/result",
+    }), 202
+
+
+@app.route("/api/jobs/<job_id>/", methods=["GET"])
+def job_status(job_id):
+    try:
+        return jsonify(jobs.public_status(job_id))
+    except KeyError:
+        return jsonify({"error": "Unknown job"}), 404
+
+
+@app.route("/api/jobs/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    try:
+        status = jobs.public_status(job_id)
+    except KeyError:
+        return jsonify({"error": "Unknown job"}), 404
+
+    if status["status"] != "done":
+        return jsonify({"error": f"Job is {status['status']}", "status": status}), 409
+
+    return Response(
+        stream_with_context(jobs.iter_result(job_id)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={job_id}.csv"},
+    )
@@ -0,0 +1,321 @@
+"""
+House Price Predictor - Model Benchmark Suite
+Measures fit time, peak memory, inference latency and accuracy for every
+model backend across a ladder of synthetic dataset sizes
+"""
+# benchmark.py
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import sklearn
+from improved_train_model import generate_realistic_housing_data
+from locality_index import (
+    CITY_CENTROIDS, build_locality_index, load_locality_index, locality_adjustment, save_locality_index,
+)
+from pipeline import MODEL_BACKENDS, encode_stage, split_stage, evaluate_stage
+from train_model import generate_indian_housing_data_vectorized
+
+RESULTS_PATH = "benchmark_results.json"
+BASELINE_PATH = "benchmark_baseline.json"
+
+SIZE_LADDER = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# name -> (generator, uses city feature)
+DATASETS = {
+    "indian": (generate_indian_housing_data_vectorized, True),
+    "us": (generate_realistic_housing_data, False),
+}
+
+FIT_REPEATS = 3
+WARMUP_ROWS = 1_000
+SINGLE_ROW_REPEATS = 200
+BATCH_ROWS = 10_000
+BATCH_REPEATS = 5
+
+# A result regresses when it is worse than the baseline by more than this
+TOLERANCES = {
+    "test_r2": 0.01,                  # absolute drop
+    "fit_time_s": 1.0,                # relative increase
+    "peak_memory_mb": 0.25,
+    "single_row_latency_ms": 1.0,
+    "batch_latency_ms": 1.0,
+}
+
+# ... and by more than this absolute amount, so timer noise on runs that only
+# take a few milliseconds is not reported as a regression. Timings (hist_gbr's
+# in particular) can flip between runs by up to 2x on their own, hence the
+# 100% relative tolerances above.
+NOISE_FLOORS = {
+    "fit_time_s": 0.1,
+    "peak_memory_mb": 1.0,
+    "single_row_latency_ms": 2.0,
+    "batch_latency_ms": 10.0,
+}
+
+# Locality lookups: index sizes (localities per city) and the latency target
+LOCALITY_LADDER = [24, 1_000]
+LOCALITY_ROWS = 1_000
+LOCALITY_REPEATS = 200
+LOCALITY_TARGET_MS = 1.0
+
+# Baselines recorded on different hardware are not comparable
+HARDWARE_KEYS = ["machine", "cpus"]
+
+
+def _timed_ms(func, repeats):
+    """Median and 95th percentile wall time of ``func()`` in milliseconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times)), float(np.percentile(times, 95))
+
+
+def benchmark_one(dataset, backend, n_rows, fit_repeats=FIT_REPEATS):
+    """
+    Benchmark a single (dataset, backend, size) combination.
+
+    A small warm-up fit and predict runs first so one-off import and
+    initialisation costs are not timed. The fit time is the median of
+    ``fit_repeats`` untraced fits; peak memory comes from one extra fit
+    under tracemalloc, which would otherwise slow the timed fits down.
+    """
+    generator, use_city = DATASETS[dataset]
+    df = generator(n_rows)
+    split = split_stage(encode_stage(df, use_city), use_city)
+    X_train, X_test, y_train, _ = split
+    del df
+
+    warmup = MODEL_BACKENDS[backend]()
+    warmup.fit(X_train.iloc[:WARMUP_ROWS], y_train.iloc[:WARMUP_ROWS])
+    warmup.predict(X_test.iloc[:1])
+
+    fit_times = []
+    for _ in range(fit_repeats):
+        model = MODEL_BACKENDS[backend]()
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_times.append(time.perf_counter() - start)
+    fit_time = float(np.median(fit_times))
+
+    tracemalloc.start()
+    MODEL_BACKENDS[backend]().fit(X_train, y_train)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    single_row = X_test.iloc[:1]
+    batch = X_test.iloc[:BATCH_ROWS]
+    single_median, single_p95 = _timed_ms(lambda: model.predict(single_row), SINGLE_ROW_REPEATS)
+    batch_median, _ = _timed_ms(lambda: model.predict(batch), BATCH_REPEATS)
+
+    metrics = evaluate_stage(model, split)
+    return {
+        "dataset": dataset,
+        "backend": backend,
+        "rows": n_rows,
+        "train_rows": len(X_train),
+        "fit_time_s": fit_time,
+        "fit_repeats": fit_repeats,
+        "peak_memory_mb": peak / 2**20,
+        "single_row_latency_ms": single_median,
+        "single_row_latency_p95_ms": single_p95,
+        "batch_rows": len(batch),
+        "batch_latency_ms": batch_median,
+        "batch_rows_per_s": len(batch) / (batch_median / 1000),
+        "test_r2": metrics["test_r2"],
+        "test_rmse": metrics["test_rmse"],
+        "test_mae": metrics["test_mae"],
+    }
+
+
+def benchmark_locality(localities_per_city, n_rows=LOCALITY_ROWS, repeats=LOCALITY_REPEATS):
+    """Time coordinate and name lookups against a saved and reloaded locality index"""
+    df = generate_indian_housing_data_vectorized(200_000)
+    start = time.perf_counter()
+    index = build_locality_index(df, localities_per_city)
+    build_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "locality_index.npz")
+        save_locality_index(index, path)
+        size_mb = os.path.getsize(path) / 2**20
+        classes = np.unique(df["city"].to_numpy().astype(str))
+        index = load_locality_index(path, classes)
+
+    rng = np.random.default_rng(0)
+    city_codes = rng.integers(0, len(classes), n_rows)
+    centres = np.array([CITY_CENTROIDS[city] for city in classes])[city_codes]
+    latitudes = centres[:, 0] + rng.normal(0, 0.06, n_rows)
+    longitudes = centres[:, 1] + rng.normal(0, 0.06, n_rows)
+    names = rng.choice(index["names"], n_rows)
+
+    coords_median, coords_p95 = _timed_ms(
+        lambda: locality_adjustment(index, city_codes, latitudes, longitudes), repeats)
+    names_median, _ = _timed_ms(
+        lambda: locality_adjustment(index, city_codes, localities=names), repeats)
+    return {
+        "localities_per_city": localities_per_city,
+        "localities": len(index["names"]),
+        "rows": n_rows,
+        "build_time_s": build_time,
+        "index_size_mb": size_mb,
+        "coordinate_lookup_ms": coords_median,
+        "coordinate_lookup_p95_ms": coords_p95,
+        "name_lookup_ms": names_median,
+    }
+
+
+def run_benchmarks(datasets, backends, sizes, fit_repeats=FIT_REPEATS):
+    """Run every combination and return the results document"""
+    results = []
+    for dataset in datasets:
+        for n_rows in sizes:
+            for backend in backends:
+                print(f"⏱️  {dataset:6} {backend:9} {n_rows:>10,} rows ...", end=" ", flush=True)
+                result = benchmark_one(dataset, backend, n_rows, fit_repeats)
+                print(f"fit {result['fit_time_s']:.3f}s, R² {result['test_r2']:.4f}")
+                results.append(result)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def hardware_mismatch(current, baseline):
+    """List the hardware properties that differ between two results documents"""
+    return [
+        f"{key} {baseline['meta'].get(key)} → {current['meta'].get(key)}"
+        for key in HARDWARE_KEYS
+        if baseline["meta"].get(key) != current["meta"].get(key)
+    ]
+
+
+def find_regressions(current, baseline, tolerances=TOLERANCES, noise_floors=NOISE_FLOORS):
+    """Compare results to a baseline and list every metric outside its tolerance"""
+    baseline_index = {(r["dataset"], r["backend"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        reference = baseline_index.get((result["dataset"], result["backend"], result["rows"]))
+        if reference is None:
+            continue
+        for metric, tolerance in tolerances.items():
+            new, old = result[metric], reference[metric]
+            if metric == "test_r2":
+                worse = old - new > tolerance
+            else:
+                worse = new - old > max(old * tolerance, noise_floors.get(metric, 0.0))
+            if worse:
+                regressions.append({
+                    "dataset": result["dataset"],
+                    "backend": result["backend"],
+                    "rows": result["rows"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                })
+    return regressions
+
+
+def confirm_regressions(regressions, baseline, fit_repeats=FIT_REPEATS):
+    """Rerun every combination that regressed and keep only the metrics that regress again"""
+    combinations = sorted({(r["dataset"], r["backend"], r["rows"]) for r in regressions})
+    print(f"\n🔁 Rerunning {len(combinations)} combination(s) to confirm regressions")
+    rerun = {"results": [benchmark_one(*combination, fit_repeats) for combination in combinations]}
+    flagged = {(r["dataset"], r["backend"], r["rows"], r["metric"]) for r in regressions}
+    return [
+        r for r in find_regressions(rerun, baseline)
+        if (r["dataset"], r["backend"], r["rows"], r["metric"]) in flagged
+    ]
+
+
+def print_summary(document):
+    """Print a results table"""
+    print(f"\n{'dataset':8} {'backend':9} {'rows':>11} {'fit s':>8} {'peak MB':>9} "
+          f"{'1-row ms':>9} {'batch ms':>9} {'R²':>7} {'RMSE':>14}")
+    print("-" * 95)
+    for r in document["results"]:
+        print(f"{r['dataset']:8} {r['backend']:9} {r['rows']:>11,} {r['fit_time_s']:>8.3f} "
+              f"{r['peak_memory_mb']:>9.1f} {r['single_row_latency_ms']:>9.3f} "
+              f"{r['batch_latency_ms']:>9.3f} {r['test_r2']:>7.4f} {r['test_rmse']:>14,.0f}")
+
+    if document.get("locality"):
+        print(f"\n{'localities':>10} {'build s':>8} {'size MB':>8} {'coords ms':>10} {'p95 ms':>8} {'names ms':>9}"
+              f"   (per {LOCALITY_ROWS:,} rows)")
+        print("-" * 74)
+        for r in document["locality"]:
+            target = "✅" if r["coordinate_lookup_p95_ms"] < LOCALITY_TARGET_MS else "⚠️ "
+            print(f"{r['localities']:>10,} {r['build_time_s']:>8.2f} {r['index_size_mb']:>8.2f} "
+                  f"{r['coordinate_lookup_ms']:>10.3f} {r['coordinate_lookup_p95_ms']:>8.3f} "
+                  f"{r['name_lookup_ms']:>9.3f}   {target}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark model backends across dataset sizes")
+    parser.add_argument("--datasets", nargs="+", default=sorted(DATASETS), choices=sorted(DATASETS))
+    parser.add_argument("--backends", nargs="+", default=sorted(MODEL_BACKENDS), choices=sorted(MODEL_BACKENDS))
+    parser.add_argument("--max-rows", type=int, default=1_000_000,
+                        help="largest rung of the size ladder to run (the full ladder goes to 10,000,000)")
+    parser.add_argument("--fit-repeats", type=int, default=FIT_REPEATS,
+                        help="timed fits per combination (the median is reported)")
+    parser.add_argument("--locality", action="store_true",
+                        help=f"also time locality lookups (target: p95 under {LOCALITY_TARGET_MS} ms per {LOCALITY_ROWS:,} rows)")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    sizes = [n for n in SIZE_LADDER if n <= args.max_rows]
+    document = run_benchmarks(args.datasets, args.backends, sizes, args.fit_repeats)
+    if args.locality:
+        document["locality"] = [benchmark_locality(n) for n in LOCALITY_LADDER]
+
+    mismatch = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatch = hardware_mismatch(document, baseline)
+        if not mismatch:
+            regressions = find_regressions(document, baseline)
+            if regressions:
+                regressions = confirm_regressions(regressions, baseline, args.fit_repeats)
+            document["regressions"] = regressions
+
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print_summary(document)
+    print(f"\n💾 Results saved as '{args.output}'")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"💾 Baseline saved as '{args.baseline}'")
+    elif mismatch:
+        print(f"\n⚠️  Not comparing against '{args.baseline}', it was recorded on different hardware "
+              f"({', '.join(mismatch)}); rerun with --update-baseline on this machine")
+    elif "regressions" in document:
+        if document["regressions"]:
+            print(f"\n🚨 {len(document['regressions'])} regression(s) against '{args.baseline}':")
+            for r in document["regressions"]:
+                print(f"   {r['dataset']} {r['backend']} {r['rows']:,} rows: "
+                      f"{r['metric']} {r['baseline']:.4g} → {r['current']:.4g}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against '{args.baseline}'")
+    else:
+        print(f"\nℹ️  No baseline at '{args.baseline}', nothing compared; "
+              f"run with --update-baseline to record one")
@@ -0,0 +1,78 @@
+"""
+House Price Predictor - Gunicorn Deployment Profile
+Preloads the model in the master so forked workers share it copy-on-write
+
+Usage:
+    gunicorn app:app                  # picks up this file automatically
+    kill -HUP <master pid>            # reload model.pkl and re-fork workers
+    python measure_worker_rss.py <master pid>
+"""
+# gunicorn.conf.py
+import gc
+import os
+from gunicorn.workers.gthread import ThreadWorker
+
+
+def _cpu_count():
+    """CPUs this process may actually run on (respects container CPU sets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Prediction is a short NumPy matrix product, so requests are mostly CPU
+# bound: one process per core plus one spare, each with a couple of threads
+# to overlap request parsing and socket I/O.
+workers = int(os.environ.get("WEB_CONCURRENCY", _cpu_count() + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 2))
+
+
+class QueueTrackingWorker(ThreadWorker):
+    """gthread worker that reports requests waiting for a thread to admission.py for load shedding"""
+
+    def enqueue_req(self, conn):
+        import admission
+
+        admission.request_waiting(+1)
+        super().enqueue_req(conn)
+
+    def handle(self, conn):
+        import admission
+
+        admission.request_waiting(-1)
+        return super().handle(conn)
+
+
+worker_class = QueueTrackingWorker
+
+# Import app.py (and load the model) once in the master before forking.
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far into the permanent GC generation, so
+    # collections in the workers never write to the shared pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Resume background jobs left unfinished by a worker that was killed
+    import jobs
+
+    jobs.get_broker()
+
+
+def on_reload(server):
+    # SIGHUP: load the retrained artifacts in the master; gunicorn then forks
+    # fresh workers from it and gracefully stops the old ones.
+    import scoring
+
+    scoring.reload_model_state()
+    server.log.info("Reloaded model artifacts from %s", scoring.MODEL_PATH)
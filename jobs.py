@@ -0,0 +1,349 @@
+"""
+House Price Predictor - Background Valuation Jobs
+Scores uploaded CSV files in chunks on a local worker pool (or Redis-fed workers)
+
+Usage:
+    python jobs.py worker             # consume jobs from JOB_BROKER_URL
+"""
+# jobs.py
+import json
+import os
+import re
+import shutil
+import socket
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from scoring import InvalidInput, predict_prices
+
+JOBS_DIR = os.environ.get("JOBS_DIR", "jobs")
+JOB_CHUNK_ROWS = int(os.environ.get("JOB_CHUNK_ROWS", 50_000))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_EXECUTOR = os.environ.get("JOB_EXECUTOR", "thread")  # "thread" or "process"
+# redis://... to hand jobs to separate `python jobs.py worker` processes
+JOB_BROKER_URL = os.environ.get("JOB_BROKER_URL")
+# Largest accepted upload, and unfinished jobs one client may have at a time
+JOB_MAX_UPLOAD_MB = int(os.environ.get("JOB_MAX_UPLOAD_MB", 100))
+JOB_MAX_ACTIVE_PER_CLIENT = int(os.environ.get("JOB_MAX_ACTIVE_PER_CLIENT", 2))
+# Finished jobs (and their results) are deleted after this long
+JOB_RETENTION_SECONDS = int(os.environ.get("JOB_RETENTION_SECONDS", 24 * 3600))
+
+REQUIRED_COLUMNS = ["sizes", "bedrooms"]
+DEFAULT_CITY = "Delhi"
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+# ---------------------------------------------------------------------------
+# Job files
+# ---------------------------------------------------------------------------
+
+def job_dir(job_id):
+    if not _JOB_ID.match(job_id):
+        raise KeyError(job_id)
+    return os.path.join(JOBS_DIR, job_id)
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _try_lock(f):
+    """Take an exclusive lock on an open file without waiting; False if another process holds it"""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
+
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def read_status(job_id):
+    """Return the status document of a job; raises KeyError for unknown jobs"""
+    try:
+        with open(os.path.join(job_dir(job_id), "status.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise KeyError(job_id)
+
+
+def public_status(job_id):
+    """The status document without fields only the server may see (the submitter's address)"""
+    status = read_status(job_id)
+    status.pop("client", None)
+    return status
+
+
+def create_job(upload, client=None):
+    """Store an uploaded CSV as a new job and queue it; returns the job id"""
+    cleanup_jobs()
+    job_id = uuid.uuid4().hex
+    path = job_dir(job_id)
+    os.makedirs(os.path.join(path, "chunks"))
+    input_path = os.path.join(path, "input.csv")
+    upload.save(input_path)
+
+    try:
+        columns = pd.read_csv(input_path, nrows=0).columns
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    except ValueError:
+        shutil.rmtree(path)
+        raise
+
+    with open(input_path, "rb") as f:
+        total_rows = max(sum(1 for _ in f) - 1, 0)
+
+    _write_json(os.path.join(path, "status.json"), {
+        "job_id": job_id,
+        "client": client,
+        "status": "queued",
+        "total_rows": total_rows,
+        "chunk_rows": JOB_CHUNK_ROWS,
+        "chunks_total": -(-total_rows // JOB_CHUNK_ROWS),
+        "chunks_done": 0,
+        "rows_done": 0,
+        "rows_failed": 0,
+        "progress": 0.0,
+        "rows_per_s": None,
+        "created": time.time(),
+        "started": None,
+        "finished": None,
+        "error": None,
+    })
+    get_broker().enqueue(job_id)
+    return job_id
+
+
+def active_jobs(client):
+    """Number of queued or running jobs submitted by ``client``"""
+    return sum(1 for job_id in pending_jobs() if read_status(job_id).get("client") == client)
+
+
+def cleanup_jobs(max_age=JOB_RETENTION_SECONDS, now=None):
+    """Delete jobs that finished more than ``max_age`` seconds ago; returns their ids"""
+    if not os.path.isdir(JOBS_DIR):
+        return []
+    now = time.time() if now is None else now
+    removed = []
+    for job_id in os.listdir(JOBS_DIR):
+        try:
+            status = read_status(job_id)
+        except KeyError:
+            continue
+        if status["status"] in ("done", "failed") and now - status["finished"] > max_age:
+            shutil.rmtree(job_dir(job_id), ignore_errors=True)
+            removed.append(job_id)
+    return removed
+
+
+def iter_result(job_id):
+    """Yield the finished result CSV chunk by chunk (header only once)"""
+    chunks = os.path.join(job_dir(job_id), "chunks")
+    for i, name in enumerate(sorted(os.listdir(chunks))):
+        with open(os.path.join(chunks, name)) as f:
+            if i > 0:
+                f.readline()
+            yield f.read()
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def run_job(job_id):
+    """
+    Score a job's input chunk by chunk, writing each finished chunk to disk.
+
+    Chunks already on disk are skipped, so a job whose worker was killed
+    resumes from its last finished chunk. An exclusive lock on the job
+    directory makes sure only one worker runs a job at a time; the OS
+    releases it if that worker dies.
+    """
+    path = job_dir(job_id)
+    lock = open(os.path.join(path, "lock"), "w")
+    if not _try_lock(lock):
+        lock.close()
+        return
+
+    with lock:
+        status = read_status(job_id)
+        if status["status"] in ("done", "failed"):
+            return
+
+        status_path = os.path.join(path, "status.json")
+        status.update(status="running", started=status["started"] or time.time())
+        _write_json(status_path, status)
+
+        start, rows_scored = time.perf_counter(), 0
+        try:
+            reader = pd.read_csv(os.path.join(path, "input.csv"), chunksize=status["chunk_rows"])
+            for i, chunk in enumerate(reader):
+                chunk_path = os.path.join(path, "chunks", f"part-{i:05d}.csv")
+                if os.path.exists(chunk_path):
+                    continue
+
+                if "cities" in chunk:
+                    cities = chunk["cities"]
+                elif "city" in chunk:
+                    cities = chunk["city"]
+                else:
+                    cities = pd.Series(DEFAULT_CITY, index=chunk.index)
+                prices, errors = score_chunk(chunk, cities)
+                pd.DataFrame({
+                    "size": chunk["sizes"],
+                    "bedroom": chunk["bedrooms"],
+                    "city": cities,
+                    "predicted_price_raw": pd.array(np.trunc(prices), dtype="Int64"),
+                    "error": errors,
+                }).to_csv(f"{chunk_path}.tmp", index=False)
+                os.replace(f"{chunk_path}.tmp", chunk_path)
+
+                rows_scored += len(chunk)
+                status["rows_failed"] = status.get("rows_failed", 0) + int((errors != "").sum())
+                status.update(
+                    chunks_done=i + 1,
+                    rows_done=min((i + 1) * status["chunk_rows"], status["total_rows"]),
+                    rows_per_s=rows_scored / (time.perf_counter() - start),
+                )
+                status["progress"] = status["rows_done"] / max(status["total_rows"], 1)
+                _write_json(status_path, status)
+
+            status.update(status="done", progress=1.0, finished=time.time())
+        except Exception as error:
+            status.update(status="failed", error=str(error), finished=time.time())
+        _write_json(status_path, status)
+
+
+def score_chunk(chunk, cities):
+    """
+    Price a chunk; returns the prices and a per-row error message ("" if none).
+
+    A chunk containing bad rows (unknown cities or localities, non-numeric
+    values) is rescored row by row, so only those rows fail and are left
+    without a price.
+    """
+    columns = [
+        chunk["sizes"],
+        chunk["bedrooms"],
+        cities,
+        chunk.get("latitudes"),
+        chunk.get("longitudes"),
+        chunk["localities"].fillna("") if "localities" in chunk else None,
+    ]
+    errors = np.full(len(chunk), "", dtype=object)
+    try:
+        return predict_prices(*columns), errors
+    except InvalidInput:
+        pass
+
+    prices = np.full(len(chunk), np.nan)
+    for row in range(len(chunk)):
+        try:
+            prices[row] = predict_prices(*[None if c is None else c.iloc[row:row + 1] for c in columns])[0]
+        except InvalidInput as error:
+            errors[row] = str(error)
+    return prices, errors
+
+
+def pending_jobs():
+    """Jobs that were queued or running when their worker went away"""
+    if not os.path.isdir(JOBS_DIR):
+        return []
+    pending = []
+    for job_id in sorted(os.listdir(JOBS_DIR)):
+        try:
+            if read_status(job_id)["status"] in ("queued", "running"):
+                pending.append(job_id)
+        except KeyError:
+            continue
+    return pending
+
+
+# ---------------------------------------------------------------------------
+# Brokers
+# ---------------------------------------------------------------------------
+
+class LocalBroker:
+    """Runs jobs on a thread or process pool inside this process"""
+
+    def __init__(self, executor=JOB_EXECUTOR, workers=JOB_WORKERS):
+        pool = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        self._pool = pool(max_workers=workers)
+        for job_id in pending_jobs():
+            self.enqueue(job_id)
+
+    def enqueue(self, job_id):
+        self._pool.submit(run_job, job_id)
+
+
+class RedisBroker:
+    """Queues job ids in Redis (or a compatible server) for `python jobs.py worker`"""
+
+    def __init__(self, url, prefix="houseprice:jobs:"):
+        import redis  # optional dependency, only needed with JOB_BROKER_URL
+
+        self._client = redis.Redis.from_url(url)
+        self._queue = f"{prefix}queue"
+        self._prefix = prefix
+
+    def enqueue(self, job_id):
+        self._client.lpush(self._queue, job_id)
+
+    def work(self, name=None):
+        """Consume jobs forever; jobs this worker held when it died are requeued first"""
+        processing = f"{self._prefix}processing:{name or socket.gethostname()}"
+        while self._client.lmove(processing, self._queue, "RIGHT", "LEFT"):
+            pass
+
+        print(f"👷 Waiting for jobs on {self._queue}")
+        while True:
+            job_id = self._client.blmove(self._queue, processing, 5, "RIGHT", "LEFT")
+            if job_id is None:
+                continue
+            job_id = job_id.decode()
+            print(f"⚙️  Running job {job_id}")
+            run_job(job_id)
+            self._client.lrem(processing, 1, job_id)
+
+
+_broker = None
+_broker_pid = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return this process's broker, creating it (and requeueing pending jobs) on first use"""
+    global _broker, _broker_pid
+    with _broker_lock:
+        # A pool created before gunicorn forked has no threads in the child
+        if _broker is None or _broker_pid != os.getpid():
+            cleanup_jobs()
+            _broker = RedisBroker(JOB_BROKER_URL) if JOB_BROKER_URL else LocalBroker()
+            _broker_pid = os.getpid()
+        return _broker
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["worker"] or not JOB_BROKER_URL:
+        print("Usage: JOB_BROKER_URL=redis://localhost:6379/0 python jobs.py worker")
+        sys.exit(1)
+    get_broker().work()
@@ -0,0 +1,312 @@
+"""
+House Price Predictor - Locality Index
+Locality centroids with cached neighbourhood price statistics and a precomputed nearest-locality grid
+"""
+# locality_index.py
+import numpy as np
+from scipy.spatial import cKDTree
+
+LOCALITY_INDEX_PATH = "locality_index.npz"
+
+EARTH_RADIUS_KM = 6371.0
+# A point further than this from every locality of its city gets no adjustment
+MAX_LOCALITY_DISTANCE_KM = 15.0
+# The same distance as a chord of the unit sphere, for KD-tree queries
+MAX_CHORD = 2 * np.sin(MAX_LOCALITY_DISTANCE_KM / EARTH_RADIUS_KM / 2)
+# Side of a cell of the precomputed nearest-locality grid (~280 m); a point
+# is matched to the locality nearest to its cell's centre
+GRID_CELL_DEG = 0.0025
+KM_PER_DEG = np.pi * EARTH_RADIUS_KM / 180
+# A locality with fewer samples than this borrows them from its nearest
+# neighbours (up to NEIGHBOURS of them) in the same city
+MIN_LOCALITY_SAMPLES = 50
+NEIGHBOURS = 5
+# Pseudo-count pulling sparsely observed localities towards the city level
+SHRINKAGE_SAMPLES = 20
+
+# Approximate city centre coordinates (latitude, longitude)
+CITY_CENTROIDS = {
+    'Mumbai': (19.076, 72.878), 'Delhi': (28.614, 77.209), 'Bangalore': (12.972, 77.595),
+    'Pune': (18.520, 73.857), 'Chennai': (13.083, 80.271), 'Hyderabad': (17.385, 78.487),
+    'Kolkata': (22.573, 88.364), 'Ahmedabad': (23.023, 72.571), 'Surat': (21.170, 72.831),
+    'Noida': (28.535, 77.391), 'Gurgaon': (28.459, 77.027), 'Ghaziabad': (28.669, 77.454),
+    'Faridabad': (28.408, 77.317), 'Jaipur': (26.912, 75.787), 'Lucknow': (26.847, 80.947),
+    'Indore': (22.720, 75.858), 'Bhopal': (23.260, 77.413), 'Kochi': (9.931, 76.267),
+    'Coimbatore': (11.017, 76.956), 'Nagpur': (21.146, 79.088), 'Visakhapatnam': (17.687, 83.218),
+    'Thiruvananthapuram': (8.524, 76.937), 'Bhubaneswar': (20.296, 85.825),
+    'Chandigarh': (30.733, 76.779), 'Mysore': (12.296, 76.639), 'Nashik': (19.998, 73.790),
+    'Vadodara': (22.307, 73.181), 'Rajkot': (22.303, 70.802), 'Kanpur': (26.449, 80.331),
+    'Ludhiana': (30.901, 75.857), 'Agra': (27.177, 78.008), 'Guwahati': (26.144, 91.736),
+    'Patna': (25.594, 85.138), 'Raipur': (21.251, 81.630), 'Dehradun': (30.317, 78.032),
+    'Jammu': (32.727, 74.857), 'Amritsar': (31.634, 74.872), 'Jalandhar': (31.326, 75.576),
+}
+
+# Well-known localities: (city, name, latitude, longitude, price premium vs. city average)
+NAMED_LOCALITIES = [
+    ('Mumbai', 'South Mumbai', 18.930, 72.826, 1.9),
+    ('Mumbai', 'Bandra', 19.060, 72.836, 1.6),
+    ('Mumbai', 'Andheri', 19.120, 72.847, 1.1),
+    ('Mumbai', 'Thane', 19.218, 72.978, 0.75),
+    ('Mumbai', 'Navi Mumbai', 19.033, 73.030, 0.7),
+    ('Delhi', 'Connaught Place', 28.632, 77.219, 1.8),
+    ('Delhi', 'Vasant Vihar', 28.560, 77.160, 1.6),
+    ('Delhi', 'Dwarka', 28.592, 77.046, 0.9),
+    ('Delhi', 'Rohini', 28.736, 77.113, 0.8),
+    ('Gurgaon', 'Golf Course Road', 28.450, 77.100, 1.5),
+    ('Bangalore', 'Indiranagar', 12.972, 77.641, 1.4),
+    ('Bangalore', 'Koramangala', 12.935, 77.624, 1.35),
+    ('Bangalore', 'Whitefield', 12.970, 77.750, 1.0),
+    ('Bangalore', 'Electronic City', 12.840, 77.677, 0.8),
+    ('Pune', 'Koregaon Park', 18.536, 73.894, 1.4),
+    ('Pune', 'Hinjewadi', 18.591, 73.739, 0.95),
+    ('Hyderabad', 'Banjara Hills', 17.414, 78.440, 1.5),
+    ('Hyderabad', 'Gachibowli', 17.440, 78.349, 1.2),
+    ('Chennai', 'Adyar', 13.006, 80.257, 1.4),
+    ('Kolkata', 'Salt Lake', 22.580, 88.417, 1.2),
+]
+
+
+class UnknownLocality(ValueError):
+    """Raised when a request names a locality that is not in the index"""
+
+
+def to_unit_vectors(latitudes, longitudes):
+    """Project latitude/longitude (degrees) onto the unit sphere for Euclidean KD-tree queries"""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def generate_localities(localities_per_city=24, seed=42):
+    """Named localities plus synthetic ones scattered around every city centre"""
+    rng = np.random.default_rng(seed)
+    cities, names, lats, lons, premiums = (list(column) for column in zip(*NAMED_LOCALITIES))
+
+    for city, (lat, lon) in CITY_CENTROIDS.items():
+        offsets = rng.normal(0, 0.06, (localities_per_city, 2))
+        distance = np.hypot(offsets[:, 0], offsets[:, 1])
+        # Central localities command a premium that fades towards the outskirts
+        premium = np.exp(rng.normal(0, 0.15, localities_per_city)) * (1.3 - 2.5 * np.minimum(distance, 0.2))
+
+        cities.extend([city] * localities_per_city)
+        names.extend(f"{city} Sector {i + 1}" for i in range(localities_per_city))
+        lats.extend(lat + offsets[:, 0])
+        lons.extend(lon + offsets[:, 1])
+        premiums.extend(premium)
+
+    return {
+        "names": np.array(names),
+        "cities": np.array(cities),
+        "latitudes": np.array(lats),
+        "longitudes": np.array(lons),
+        "premiums": np.array(premiums),
+    }
+
+
+def build_locality_index(df, localities_per_city=24, seed=42):
+    """
+    Build the locality table and its neighbourhood price statistics.
+
+    The synthetic training data has no coordinates, so every row is placed in
+    a random locality of its city and its price scaled by that locality's
+    premium, as a real dataset with locality labels would look. Each
+    locality's price index is the median price per sq ft of its samples
+    (topped up from its nearest neighbours when it has too few) relative to
+    the city median, shrunk towards 1 when few samples back it.
+    """
+    rng = np.random.default_rng(seed)
+    localities = generate_localities(localities_per_city, seed)
+    loc_cities = localities["cities"]
+
+    # Place every training row in one of its city's localities
+    sample_cities = df["city"].to_numpy().astype(str)
+    sample_locality = np.empty(len(df), dtype=np.int64)
+    for city in np.unique(sample_cities):
+        rows = np.flatnonzero(sample_cities == city)
+        sample_locality[rows] = rng.choice(np.flatnonzero(loc_cities == city), len(rows))
+    price_per_sqft = df["prices"].to_numpy() / df["sizes"].to_numpy() * localities["premiums"][sample_locality]
+
+    city_median = {city: np.median(price_per_sqft[sample_cities == city]) for city in np.unique(sample_cities)}
+
+    # Price-per-sq-ft samples grouped by locality
+    order = np.argsort(sample_locality, kind="stable")
+    boundaries = np.cumsum(np.bincount(sample_locality, minlength=len(loc_cities)))[:-1]
+    samples_by_locality = np.split(price_per_sqft[order], boundaries)
+
+    points = to_unit_vectors(localities["latitudes"], localities["longitudes"])
+    n_samples = np.bincount(sample_locality, minlength=len(loc_cities))
+    median_ppsf = np.full(len(loc_cities), np.nan)
+    price_index = np.ones(len(loc_cities))
+
+    for city in np.unique(loc_cities):
+        members = np.flatnonzero(loc_cities == city)
+        if city not in city_median:
+            continue
+        tree = cKDTree(points[members])
+        _, neighbours = tree.query(points[members], k=min(NEIGHBOURS, len(members)))
+        neighbours = members[neighbours.reshape(len(members), -1)]
+        for locality, nearest in zip(members, neighbours):
+            # nearest[0] is the locality itself
+            pooled = [samples_by_locality[nearest[0]]]
+            for neighbour in nearest[1:]:
+                if sum(len(values) for values in pooled) >= MIN_LOCALITY_SAMPLES:
+                    break
+                pooled.append(samples_by_locality[neighbour])
+            values = np.concatenate(pooled)
+            if len(values) == 0:
+                continue
+            median_ppsf[locality] = np.median(values)
+            ratio = median_ppsf[locality] / city_median[city]
+            price_index[locality] = (len(values) * ratio + SHRINKAGE_SAMPLES) / (len(values) + SHRINKAGE_SAMPLES)
+
+    index = {
+        "names": localities["names"],
+        "cities": loc_cities,
+        "latitudes": localities["latitudes"],
+        "longitudes": localities["longitudes"],
+        "n_samples": n_samples,
+        "median_price_per_sqft": median_ppsf,
+        "price_index": price_index,
+    }
+    index.update(build_locality_grid(index))
+    return index
+
+
+def build_locality_grid(index, cell_deg=GRID_CELL_DEG):
+    """
+    Rasterize every city into a grid of cells holding the nearest locality.
+
+    Each city gets a box covering its localities plus MAX_LOCALITY_DISTANCE_KM
+    on every side. Every cell stores the locality of that city nearest to the
+    cell's centre, or -1 when none is within MAX_LOCALITY_DISTANCE_KM. At
+    serving time a coordinate lookup is then plain array indexing instead
+    of a KD-tree query per point, at the cost of matching by cell centre
+    (at most ~0.2 km off).
+    """
+    grid_cities, origins, shapes, offsets, cells = [], [], [], [], []
+    offset = 0
+    points = to_unit_vectors(index["latitudes"], index["longitudes"])
+
+    for city in np.unique(index["cities"]):
+        members = np.flatnonzero(index["cities"] == city)
+        lat, lon = index["latitudes"][members], index["longitudes"][members]
+        pad_lat = MAX_LOCALITY_DISTANCE_KM / KM_PER_DEG
+        pad_lon = pad_lat / np.cos(np.radians(np.abs(lat).max() + pad_lat))
+        origin = np.array([lat.min() - pad_lat, lon.min() - pad_lon])
+        shape = np.ceil((np.array([lat.max() + pad_lat, lon.max() + pad_lon]) - origin) / cell_deg).astype(np.int64)
+
+        rows, cols = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]), indexing="ij")
+        centres = to_unit_vectors(origin[0] + (rows.ravel() + 0.5) * cell_deg,
+                                  origin[1] + (cols.ravel() + 0.5) * cell_deg)
+        distance, nearest = cKDTree(points[members]).query(centres, distance_upper_bound=MAX_CHORD)
+        found = np.isfinite(distance)
+        nearest_locality = np.full(len(centres), -1, dtype=np.int32)
+        nearest_locality[found] = members[nearest[found]]
+
+        grid_cities.append(city)
+        origins.append(origin)
+        shapes.append(shape)
+        offsets.append(offset)
+        cells.append(nearest_locality)
+        offset += len(nearest_locality)
+
+    return {
+        "grid_cities": np.array(grid_cities),
+        "grid_origins": np.array(origins),
+        "grid_shapes": np.array(shapes),
+        "grid_offsets": np.array(offsets, dtype=np.int64),
+        "grid_cells": np.concatenate(cells),
+    }
+
+
+def save_locality_index(index, path=LOCALITY_INDEX_PATH):
+    np.savez_compressed(path, **index)
+
+
+# ---------------------------------------------------------------------------
+# Serving
+# ---------------------------------------------------------------------------
+
+def load_locality_index(path=LOCALITY_INDEX_PATH, city_classes=None):
+    """
+    Load the locality table and its grid as read-only arrays.
+
+    Names are kept sorted (with the permutation back to table order) so a
+    batch of locality names can be looked up with one searchsorted call.
+    Cities are stored as their codes in ``city_classes`` (the city encoder's
+    sorted classes, -1 if absent), so rows are matched to their city's grid
+    and localities without comparing strings.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        index = {key: np.array(data[key]) for key in data.files}
+
+    order = np.argsort(index["names"])
+    index["sorted_names"] = index["names"][order]
+    index["name_order"] = order
+
+    classes = np.asarray(city_classes if city_classes is not None else [], dtype=str)
+    index["city_codes"] = _codes(classes, index["cities"])
+    # City code -> grid box (or -1)
+    grid_for_code = np.full(len(classes) + 1, -1, dtype=np.int64)
+    box_codes = _codes(classes, index["grid_cities"])
+    grid_for_code[box_codes[box_codes >= 0]] = np.flatnonzero(box_codes >= 0)
+    index["grid_for_code"] = grid_for_code
+
+    for value in index.values():
+        value.setflags(write=False)
+    return index
+
+
+def _codes(classes, values):
+    """Position of every value in the sorted ``classes`` array, -1 if missing"""
+    codes = np.full(len(values), -1, dtype=np.int64)
+    if len(classes):
+        positions = np.minimum(np.searchsorted(classes, values), len(classes) - 1)
+        known = classes[positions] == values
+        codes[known] = positions[known]
+    return codes
+
+
+def locality_adjustment(index, city_codes, latitudes=None, longitudes=None, localities=None):
+    """
+    Price multiplier for every row of a batch.
+
+    Rows with a locality name use that locality; otherwise rows with
+    coordinates use the locality of their city nearest to them (within
+    MAX_LOCALITY_DISTANCE_KM), read from the precomputed grid. The
+    multiplier only applies when the locality is in the row's city
+    (``city_codes`` are the rows' encoded cities); every other row gets 1.0.
+    Raises UnknownLocality for names that are not in the index.
+    """
+    city_codes = np.asarray(city_codes)
+    matched = np.full(len(city_codes), -1, dtype=np.int64)
+
+    if latitudes is not None and longitudes is not None:
+        lat = np.asarray(latitudes, dtype=np.float64)
+        lon = np.asarray(longitudes, dtype=np.float64)
+        box = index["grid_for_code"][city_codes]
+        origin = index["grid_origins"][box]
+        shape = index["grid_shapes"][box]
+        # NaN coordinates compare false below, so they fall outside every grid
+        row = np.floor((lat - origin[:, 0]) / GRID_CELL_DEG)
+        col = np.floor((lon - origin[:, 1]) / GRID_CELL_DEG)
+        inside = (box >= 0) & (row >= 0) & (row < shape[:, 0]) & (col >= 0) & (col < shape[:, 1])
+        cell = index["grid_offsets"][box] + np.where(inside, row * shape[:, 1] + col, 0).astype(np.int64)
+        matched = np.where(inside, index["grid_cells"][cell], -1)
+
+    if localities is not None:
+        names = np.asarray([name or "" for name in localities], dtype=str)
+        has_name = names != ""
+        if has_name.any():
+            sorted_names = index["sorted_names"]
+            positions = np.searchsorted(sorted_names, names[has_name])
+            known = positions < len(sorted_names)
+            known[known] = sorted_names[positions[known]] == names[has_name][known]
+            if not known.all():
+                raise UnknownLocality(f"Unknown locality: {sorted(set(names[has_name][~known].tolist()))}")
+            matched[has_name] = index["name_order"][positions]
+
+    hit = matched >= 0
+    hit[hit] = index["city_codes"][matched[hit]] == city_codes[hit]
+    return np.where(hit, index["price_index"][np.maximum(matched, 0)], 1.0)
@@ -0,0 +1,51 @@
+"""
+House Price Predictor - Worker Memory Measurement
+Reports RSS, PSS and shared/private memory for every gunicorn worker (Linux only)
+"""
+# measure_worker_rss.py
+import sys
+
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"]
+
+
+def read_smaps_rollup(pid):
+    """Read memory counters (in kB) for a process from /proc/<pid>/smaps_rollup"""
+    counters = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].rstrip(":") in FIELDS:
+                counters[parts[0].rstrip(":")] = int(parts[1])
+    return counters
+
+
+def worker_pids(master_pid):
+    """List the child processes of the gunicorn master"""
+    pids = []
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        pids.extend(int(pid) for pid in f.read().split())
+    return sorted(pids)
+
+
+def measure(master_pid):
+    """Print per-process memory for the master and its workers"""
+    print(f"{'process':>16} " + " ".join(f"{field:>14}" for field in FIELDS))
+
+    rows = [("master", master_pid)] + [(f"worker {pid}", pid) for pid in worker_pids(master_pid)]
+    totals = {field: 0 for field in FIELDS}
+    for label, pid in rows:
+        counters = read_smaps_rollup(pid)
+        for field in FIELDS:
+            totals[field] += counters.get(field, 0)
+        print(f"{label:>16} " + " ".join(f"{counters.get(field, 0):>11} kB" for field in FIELDS))
+
+    print(f"{'total':>16} " + " ".join(f"{totals[field]:>11} kB" for field in FIELDS))
+    print("\n💡 Pss splits shared pages between the processes sharing them; the sum of")
+    print("   Pss is the real memory cost. Private_Dirty is what each worker owns alone.")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python measure_worker_rss.py <gunicorn master pid>")
+        sys.exit(1)
+    measure(int(sys.argv[1]))
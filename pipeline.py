@@ -0,0 +1,268 @@
+"""
+House Price Predictor - Reproducible Training Pipeline
+Runs data generation, encoding, splitting, fitting and evaluation as cached stages
+"""
+# pipeline.py
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+import platform
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.preprocessing import LabelEncoder
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from locality_index import build_locality_index, generate_localities, save_locality_index
+from train_model import generate_indian_housing_data_vectorized
+
+CACHE_DIR = ".pipeline_cache"
+
+# Each pipeline reproduces one of the training scripts and writes the
+# artifacts that script writes (model.pkl and city_encoder.pkl are the ones
+# app.py loads).
+PIPELINES = {
+    "train": {
+        "generator": ("train_model", "generate_realistic_indian_housing_data"),
+        "n_samples": 1000,
+        "use_city": True,
+        "model_path": "model.pkl",
+        "encoder_path": "city_encoder.pkl",
+        "locality_index_path": "locality_index.npz",
+    },
+    "enhanced": {
+        "generator": ("enhanced_model_with_location", "generate_enhanced_indian_housing_data"),
+        "n_samples": 1000,
+        "use_city": True,
+        "model_path": "enhanced_model.pkl",
+        # Not city_encoder.pkl: that one belongs to model.pkl (38 cities, not 8)
+        "encoder_path": "enhanced_city_encoder.pkl",
+    },
+    "improved": {
+        "generator": ("improved_train_model", "generate_realistic_housing_data"),
+        "n_samples": 1000,
+        "use_city": False,
+        "model_path": "improved_model.pkl",
+        "encoder_path": None,
+    },
+}
+
+# Rows generated to compute the locality price statistics; the 1,000-row
+# training set leaves most localities with no samples at all.
+LOCALITY_SAMPLES = 200_000
+
+# Model backends that can be fitted by the pipeline and compared by benchmark.py
+MODEL_BACKENDS = {
+    "linear": lambda: LinearRegression(),
+    "ridge": lambda: Ridge(alpha=1.0),
+    "hist_gbr": lambda: HistGradientBoostingRegressor(random_state=42),
+}
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def generate_stage(generator, n_samples):
+    """Generate the synthetic housing dataset"""
+    return load_generator(generator)(n_samples)
+
+
+def encode_stage(df, use_city):
+    """Label-encode the city column (if the pipeline uses location)"""
+    df = df.copy()
+    if not use_city:
+        return df, None
+
+    label_encoder = LabelEncoder()
+    df["city_encoded"] = label_encoder.fit_transform(df["city"])
+    return df, label_encoder
+
+
+def split_stage(encoded, use_city, test_size=0.2, random_state=42):
+    """Split features and target into training and testing sets"""
+    df, _ = encoded
+    features = ["sizes", "bedrooms", "city_encoded"] if use_city else ["sizes", "bedrooms"]
+    return train_test_split(df[features], df["prices"], test_size=test_size, random_state=random_state)
+
+
+def locality_stage(n_samples):
+    """Build the locality index and its neighbourhood price statistics"""
+    return build_locality_index(generate_indian_housing_data_vectorized(n_samples))
+
+
+def fit_stage(split, backend="linear"):
+    """Fit the regression model on the training set"""
+    X_train, _, y_train, _ = split
+    model = MODEL_BACKENDS[backend]()
+    model.fit(X_train, y_train)
+    return model
+
+
+def evaluate_stage(model, split):
+    """Compute R², RMSE and MAE on the training and testing sets"""
+    X_train, X_test, y_train, y_test = split
+    y_train_pred = model.predict(X_train)
+    y_test_pred = model.predict(X_test)
+    return {
+        "train_r2": float(r2_score(y_train, y_train_pred)),
+        "test_r2": float(r2_score(y_test, y_test_pred)),
+        "train_rmse": float(np.sqrt(mean_squared_error(y_train, y_train_pred))),
+        "test_rmse": float(np.sqrt(mean_squared_error(y_test, y_test_pred))),
+        "train_mae": float(mean_absolute_error(y_train, y_train_pred)),
+        "test_mae": float(mean_absolute_error(y_test, y_test_pred)),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed cache
+# ---------------------------------------------------------------------------
+
+def code_fingerprint(*objects):
+    """
+    Hash the source files defining the given functions or modules.
+
+    Whole files are hashed rather than single functions, so edits to the
+    module-level constants and helpers a stage relies on invalidate it too.
+    """
+    digest = hashlib.sha256()
+    for path in sorted({os.path.abspath(inspect.getsourcefile(obj)) for obj in objects}):
+        digest.update(f"{os.path.basename(path)}\n".encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def library_versions():
+    """Versions of the interpreter and libraries whose behaviour stage outputs depend on"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "scipy": scipy.__version__,
+    }
+
+
+def stage_key(name, func, params, upstream_keys, code=()):
+    """Hash a stage's name, code, library versions, parameters and upstream stage keys"""
+    payload = json.dumps({
+        "stage": name,
+        "code": code_fingerprint(func, *code),
+        "libraries": library_versions(),
+        "params": params,
+        "upstream": list(upstream_keys),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_stage(name, func, params=None, inputs=(), code=(), force=False):
+    """
+    Run one stage, or load its output from the cache if nothing it depends on changed.
+
+    ``inputs`` are ``(key, value)`` pairs returned by upstream stages; their
+    values are passed positionally to ``func`` and their keys feed this stage's
+    key, so a change anywhere upstream invalidates everything downstream.
+    """
+    params = params or {}
+    key = stage_key(name, func, params, [k for k, _ in inputs], code)
+    path = os.path.join(CACHE_DIR, f"{name}-{key[:16]}.pkl")
+
+    if not force and os.path.exists(path):
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        print(f"⏭️  {name:9} cached ({key[:12]})")
+        return key, value
+
+    value = func(*[v for _, v in inputs], **params)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(value, f)
+    os.replace(tmp_path, path)
+    print(f"✅ {name:9} ran    ({key[:12]})")
+    return key, value
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def load_generator(spec):
+    """Import a data generator given as ``(module, function)``"""
+    module_name, func_name = spec
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def run_pipeline(name, n_samples=None, backend="linear", force=False):
+    """Run a named pipeline and write its model (and encoder) artifacts"""
+    config = PIPELINES[name]
+    n_samples = n_samples or config["n_samples"]
+    use_city = config["use_city"]
+
+    print(f"🏗️  Running '{name}' pipeline ({n_samples} samples)")
+    print("=" * 60)
+
+    data = run_stage(
+        "generate",
+        generate_stage,
+        params={"generator": list(config["generator"]), "n_samples": n_samples},
+        code=(load_generator(config["generator"]),),
+        force=force,
+    )
+    encoded = run_stage("encode", encode_stage, {"use_city": use_city}, [data], force=force)
+    split = run_stage("split", split_stage, {"use_city": use_city}, [encoded], force=force)
+    model = run_stage(
+        "fit", fit_stage, {"backend": backend}, [split], code=(MODEL_BACKENDS[backend],), force=force
+    )
+    metrics = run_stage("evaluate", evaluate_stage, inputs=[model, split], force=force)
+
+    if config.get("locality_index_path"):
+        localities = run_stage(
+            "locality",
+            locality_stage,
+            {"n_samples": LOCALITY_SAMPLES},
+            code=(generate_indian_housing_data_vectorized, build_locality_index, generate_localities),
+            force=force,
+        )
+
+    # Artifacts are always rewritten from the (possibly cached) stage outputs,
+    # so app.py sees exactly what the pipeline produced.
+    with open(config["model_path"], "wb") as f:
+        pickle.dump(model[1], f)
+    print(f"💾 Model saved as '{config['model_path']}'")
+
+    if config["encoder_path"]:
+        with open(config["encoder_path"], "wb") as f:
+            pickle.dump(encoded[1][1], f)
+        print(f"💾 City encoder saved as '{config['encoder_path']}'")
+
+    if config.get("locality_index_path"):
+        save_locality_index(localities[1], config["locality_index_path"])
+        print(f"💾 Locality index saved as '{config['locality_index_path']}'")
+
+    print(f"\n🎯 Model Performance:")
+    print(f"   Testing R² Score: {metrics[1]['test_r2']:.4f}")
+    print(f"   Testing RMSE: {metrics[1]['test_rmse']:,.2f}")
+    print(f"   Testing MAE: {metrics[1]['test_mae']:,.2f}")
+
+    return model[1], metrics[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a cached training pipeline")
+    parser.add_argument("pipeline", nargs="?", default="train", choices=sorted(PIPELINES))
+    parser.add_argument("--samples", type=int, default=None, help="number of rows to generate")
+    parser.add_argument("--backend", default="linear", choices=sorted(MODEL_BACKENDS))
+    parser.add_argument("--force", action="store_true", help="ignore the cache and rerun every stage")
+    args = parser.parse_args()
+
+    run_pipeline(args.pipeline, n_samples=args.samples, backend=args.backend, force=args.force)
@@ -0,0 +1,55 @@
+"""
+House Price Predictor - Columnar Response Formats
+Encodes a batch of predictions as column arrays instead of one dict per row
+"""
+# responses.py
+import json
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional dependency, only needed for the Arrow format
+    pa = None
+
+ROW_JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.houseprice.columnar+json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+FLOAT64_BINARY = "application/octet-stream"
+
+# Row-oriented JSON comes first so that "*/*" (and no Accept header) keeps
+# the shape the frontend expects.
+RESPONSE_FORMATS = [ROW_JSON, COLUMNAR_JSON, FLOAT64_BINARY] + ([ARROW_STREAM] if pa else [])
+
+
+def columnar_json(sizes, bedrooms, cities, prices):
+    """Struct-of-arrays JSON: one array per field, all the same length"""
+    return json.dumps({
+        "message": "Prediction results",
+        "rows": len(prices),
+        "columns": {
+            "size": sizes,
+            "bedroom": bedrooms,
+            "city": cities,
+            "predicted_price_raw": prices.astype(np.int64).tolist(),
+        },
+    }, separators=(",", ":"), ensure_ascii=False)
+
+
+def arrow_stream(sizes, bedrooms, cities, prices):
+    """Apache Arrow IPC stream with a single record batch"""
+    batch = pa.record_batch([
+        pa.array(np.asarray(sizes)),
+        pa.array(np.asarray(bedrooms)),
+        pa.array(cities, type=pa.string()).dictionary_encode(),
+        pa.array(prices.astype(np.int64)),
+    ], names=["size", "bedroom", "city", "predicted_price_raw"])
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def float64_binary(prices):
+    """Raw little-endian float64 predicted prices, in request order"""
+    return np.ascontiguousarray(prices, dtype="<f8").tobytes()
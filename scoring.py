@@ -0,0 +1,162 @@
+"""
+House Price Predictor - Scoring Core
+Loads the trained model once and predicts prices straight from NumPy arrays
+"""
+# scoring.py
+import pickle
+import numpy as np
+import pandas as pd
+from locality_index import LOCALITY_INDEX_PATH, UnknownLocality, load_locality_index, locality_adjustment
+
+MODEL_PATH = "model.pkl"
+ENCODER_PATH = "city_encoder.pkl"
+
+FEATURES = ["sizes", "bedrooms", "city_encoded"]
+
+_model_state = None
+
+
+class InvalidInput(ValueError):
+    """Raised for input the model cannot score: unknown cities or localities, bad or mismatched columns"""
+
+
+def _read_only(array):
+    """Return a contiguous copy of ``array`` that can no longer be written to"""
+    array = np.array(array, order="C")
+    array.setflags(write=False)
+    return array
+
+
+def load_model_state(model_path=MODEL_PATH, encoder_path=ENCODER_PATH, locality_path=LOCALITY_INDEX_PATH):
+    """
+    Load the model and city encoder into plain, read-only NumPy buffers.
+
+    A linear model is reduced to its coefficients and intercept, and the
+    encoder to its sorted array of city names. Those buffers hold no Python
+    object references, so once gunicorn forks its workers from a preloaded
+    master the pages stay shared copy-on-write instead of being dirtied by
+    reference counting and garbage collection.
+    """
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+
+    try:
+        with open(encoder_path, "rb") as f:
+            city_encoder = pickle.load(f)
+        cities = _read_only(np.asarray(city_encoder.classes_, dtype=str))
+    except FileNotFoundError:
+        # Fallback: model without city encoding
+        cities = None
+
+    try:
+        localities = load_locality_index(locality_path, cities) if cities is not None else None
+    except FileNotFoundError:
+        # Fallback: city-level pricing only
+        localities = None
+
+    state = {"model": model, "cities": cities, "localities": localities, "coef": None, "intercept": 0.0}
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        state["coef"] = _read_only(np.asarray(model.coef_, dtype=np.float64).ravel())
+        state["intercept"] = float(np.ravel(model.intercept_)[0])
+    return state
+
+
+def get_model_state():
+    """Return the process-wide model state, loading it on first use"""
+    global _model_state
+    if _model_state is None:
+        _model_state = load_model_state()
+    return _model_state
+
+
+def reload_model_state():
+    """Reload the model artifacts from disk (e.g. after retraining)"""
+    global _model_state
+    _model_state = load_model_state()
+    return _model_state
+
+
+def encode_cities(cities, state=None):
+    """Vectorized equivalent of ``LabelEncoder.transform`` for city names"""
+    state = state or get_model_state()
+    classes = state["cities"]
+    cities = np.asarray(cities, dtype=str)
+
+    codes = np.searchsorted(classes, cities)
+    known = codes < len(classes)
+    known[known] = classes[codes[known]] == cities[known]
+    if not known.all():
+        raise InvalidInput(f"y contains previously unseen labels: {sorted(set(cities[~known].tolist()))}")
+    return codes
+
+
+def predict_prices(sizes, bedrooms, cities=None, latitudes=None, longitudes=None, localities=None, state=None):
+    """
+    Predict prices for a batch of houses and return them as a float64 array.
+
+    Optional per-row latitudes/longitudes or locality names scale the
+    city-level prediction by the matching locality's price index.
+    """
+    state = state or get_model_state()
+
+    n_rows = len(sizes)
+    optional = {"cities": cities, "latitudes": latitudes, "longitudes": longitudes, "localities": localities}
+    for name, values in {"bedrooms": bedrooms, **optional}.items():
+        if values is not None and len(values) != n_rows:
+            raise InvalidInput(f"'{name}' has {len(values)} values but 'sizes' has {n_rows}")
+    if (latitudes is None) != (longitudes is None):
+        raise InvalidInput("'latitudes' and 'longitudes' must be given together")
+
+    columns = [_numeric("sizes", sizes), _numeric("bedrooms", bedrooms)]
+    city_codes = None
+    if state["cities"] is not None:
+        city_codes = encode_cities(cities, state)
+        columns.append(city_codes)
+    X = np.column_stack(columns)
+
+    if state["coef"] is not None:
+        prices = X @ state["coef"] + state["intercept"]
+    else:
+        prices = np.asarray(state["model"].predict(pd.DataFrame(X, columns=FEATURES[:X.shape[1]])), dtype=np.float64)
+
+    has_location = latitudes is not None or localities is not None
+    if has_location and state["localities"] is not None:
+        if latitudes is not None:
+            latitudes = _numeric("latitudes", latitudes, allow_missing=True)
+            longitudes = _numeric("longitudes", longitudes, allow_missing=True)
+        try:
+            prices *= locality_adjustment(state["localities"], city_codes, latitudes, longitudes, localities)
+        except UnknownLocality as error:
+            raise InvalidInput(str(error)) from error
+
+    # JSON and Arrow responses (and job results) carry the raw price as a 64-bit integer
+    if not (np.isfinite(prices) & (np.abs(prices) < np.iinfo(np.int64).max)).all():
+        raise InvalidInput("Inputs are out of range: the predicted price is not a representable number")
+    return prices
+
+
+def _numeric(name, values, allow_missing=False):
+    """
+    ``values`` as a 1-D float64 array.
+
+    Missing values (None/NaN) are only allowed with ``allow_missing``, and
+    become NaN; otherwise every value must be a finite number.
+    """
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise InvalidInput(f"'{name}' must only contain numbers")
+    if array.ndim != 1:
+        raise InvalidInput(f"'{name}' must be a flat list of numbers")
+    if not allow_missing and not np.isfinite(array).all():
+        raise InvalidInput(f"'{name}' must only contain finite numbers (no nulls)")
+    return array
+
+
+def format_price(price):
+    """Format price in Indian Rupees"""
+    if price >= 10000000:  # 1 Crore or more
+        return f"₹{price/10000000:.2f} Cr"
+    elif price >= 100000:  # 1 Lakh or more
+        return f"₹{price/100000:.2f} L"
+    return f"₹{price:,.0f}"
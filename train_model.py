@@ -11,86 +11,88 @@ from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from locality_index import build_locality_index, save_locality_index
+
+
+# Define comprehensive Indian cities with their typical price multipliers
+CITIES = [
+    # Tier-1 Metropolitan Cities (Most Expensive)
+    'Mumbai', 'Delhi', 'Bangalore', 'Pune', 'Chennai', 'Hyderabad', 'Kolkata',
+    
+    # Tier-1 Major Cities
+    'Ahmedabad', 'Surat', 'Noida', 'Gurgaon', 'Ghaziabad', 'Faridabad',
+    
+    # Tier-2 State Capitals & Major Cities
+    'Jaipur', 'Lucknow', 'Indore', 'Bhopal', 'Kochi', 'Coimbatore', 'Nagpur',
+    'Visakhapatnam', 'Thiruvananthapuram', 'Bhubaneswar', 'Chandigarh',
+    
+    # Tier-2 Industrial & Tech Hubs
+    'Mysore', 'Nashik', 'Vadodara', 'Rajkot', 'Kanpur', 'Ludhiana', 'Agra',
+    
+    # Tier-3 Emerging Cities
+    'Guwahati', 'Patna', 'Raipur', 'Dehradun', 'Jammu', 'Amritsar', 'Jalandhar'
+]
+
+CITY_PRICE_MULTIPLIERS = {
+    # Tier-1 Metropolitan (₹15,000-25,000 per sq ft)
+    'Mumbai': 4.5,      # Most expensive - SoBo, Bandra
+    'Delhi': 3.8,       # NCR - Central Delhi, CP area  
+    'Gurgaon': 3.5,     # IT hub, corporate offices
+    'Noida': 3.2,       # IT sector, close to Delhi
+    'Bangalore': 3.0,   # IT capital of India
+    'Pune': 2.8,        # IT hub, automobile sector
+    'Chennai': 2.5,     # IT corridor, automobile hub
+    'Hyderabad': 2.3,   # HITEC City, pharma hub
+    'Kolkata': 2.0,     # Cultural capital
+    
+    # Tier-1 Major Cities (₹8,000-15,000 per sq ft)
+    'Ahmedabad': 1.8,   # Commercial capital of Gujarat
+    'Surat': 1.6,       # Diamond & textile hub
+    'Ghaziabad': 1.8,   # Delhi NCR extension
+    'Faridabad': 1.7,   # Industrial hub near Delhi
+    
+    # Tier-2 State Capitals (₹6,000-10,000 per sq ft)
+    'Jaipur': 1.5,     # Pink city, tourism
+    'Lucknow': 1.3,    # UP capital
+    'Bhopal': 1.2,     # MP capital
+    'Indore': 1.4,     # Commercial hub MP
+    'Chandigarh': 2.2,  # Planned city, Punjab/Haryana capital
+    'Kochi': 1.6,      # IT hub Kerala
+    'Thiruvananthapuram': 1.4,  # Kerala capital
+    'Coimbatore': 1.3,  # Textile hub Tamil Nadu
+    'Nagpur': 1.2,     # Orange city, central India
+    'Visakhapatnam': 1.3, # Port city Andhra Pradesh
+    'Bhubaneswar': 1.3, # Odisha capital, IT growth
+    
+    # Tier-2 Industrial Hubs (₹5,000-8,000 per sq ft)
+    'Vadodara': 1.3,   # Petrochemical hub Gujarat
+    'Rajkot': 1.2,     # Industrial city Gujarat
+    'Nashik': 1.3,     # Wine capital, near Mumbai
+    'Mysore': 1.2,     # IT city near Bangalore
+    'Kanpur': 1.1,     # Industrial city UP
+    'Ludhiana': 1.2,   # Industrial hub Punjab
+    'Agra': 1.0,       # Heritage city UP
+    
+    # Tier-3 Emerging Cities (₹3,000-6,000 per sq ft)
+    'Patna': 1.0,      # Bihar capital
+    'Guwahati': 1.1,   # Gateway to Northeast
+    'Raipur': 0.9,     # Chhattisgarh capital
+    'Dehradun': 1.2,   # Uttarakhand capital, hill station
+    'Jammu': 1.0,      # J&K winter capital
+    'Amritsar': 1.1,   # Golden temple city
+    'Jalandhar': 1.0   # Sports goods hub Punjab
+}
 
 
 def generate_realistic_indian_housing_data(n_samples=1000):
     """Generate realistic Indian housing data with location parameter"""
     np.random.seed(42)  # For reproducible results
     
-    # Define comprehensive Indian cities with their typical price multipliers
-    cities = [
-        # Tier-1 Metropolitan Cities (Most Expensive)
-        'Mumbai', 'Delhi', 'Bangalore', 'Pune', 'Chennai', 'Hyderabad', 'Kolkata',
-        
-        # Tier-1 Major Cities
-        'Ahmedabad', 'Surat', 'Noida', 'Gurgaon', 'Ghaziabad', 'Faridabad',
-        
-        # Tier-2 State Capitals & Major Cities
-        'Jaipur', 'Lucknow', 'Indore', 'Bhopal', 'Kochi', 'Coimbatore', 'Nagpur',
-        'Visakhapatnam', 'Thiruvananthapuram', 'Bhubaneswar', 'Chandigarh',
-        
-        # Tier-2 Industrial & Tech Hubs
-        'Mysore', 'Nashik', 'Vadodara', 'Rajkot', 'Kanpur', 'Ludhiana', 'Agra',
-        
-        # Tier-3 Emerging Cities
-        'Guwahati', 'Patna', 'Raipur', 'Dehradun', 'Jammu', 'Amritsar', 'Jalandhar'
-    ]
-    
-    city_price_multipliers = {
-        # Tier-1 Metropolitan (₹15,000-25,000 per sq ft)
-        'Mumbai': 4.5,      # Most expensive - SoBo, Bandra
-        'Delhi': 3.8,       # NCR - Central Delhi, CP area  
-        'Gurgaon': 3.5,     # IT hub, corporate offices
-        'Noida': 3.2,       # IT sector, close to Delhi
-        'Bangalore': 3.0,   # IT capital of India
-        'Pune': 2.8,        # IT hub, automobile sector
-        'Chennai': 2.5,     # IT corridor, automobile hub
-        'Hyderabad': 2.3,   # HITEC City, pharma hub
-        'Kolkata': 2.0,     # Cultural capital
-        
-        # Tier-1 Major Cities (₹8,000-15,000 per sq ft)
-        'Ahmedabad': 1.8,   # Commercial capital of Gujarat
-        'Surat': 1.6,       # Diamond & textile hub
-        'Ghaziabad': 1.8,   # Delhi NCR extension
-        'Faridabad': 1.7,   # Industrial hub near Delhi
-        
-        # Tier-2 State Capitals (₹6,000-10,000 per sq ft)
-        'Jaipur': 1.5,     # Pink city, tourism
-        'Lucknow': 1.3,    # UP capital
-        'Bhopal': 1.2,     # MP capital
-        'Indore': 1.4,     # Commercial hub MP
-        'Chandigarh': 2.2,  # Planned city, Punjab/Haryana capital
-        'Kochi': 1.6,      # IT hub Kerala
-        'Thiruvananthapuram': 1.4,  # Kerala capital
-        'Coimbatore': 1.3,  # Textile hub Tamil Nadu
-        'Nagpur': 1.2,     # Orange city, central India
-        'Visakhapatnam': 1.3, # Port city Andhra Pradesh
-        'Bhubaneswar': 1.3, # Odisha capital, IT growth
-        
-        # Tier-2 Industrial Hubs (₹5,000-8,000 per sq ft)
-        'Vadodara': 1.3,   # Petrochemical hub Gujarat
-        'Rajkot': 1.2,     # Industrial city Gujarat
-        'Nashik': 1.3,     # Wine capital, near Mumbai
-        'Mysore': 1.2,     # IT city near Bangalore
-        'Kanpur': 1.1,     # Industrial city UP
-        'Ludhiana': 1.2,   # Industrial hub Punjab
-        'Agra': 1.0,       # Heritage city UP
-        
-        # Tier-3 Emerging Cities (₹3,000-6,000 per sq ft)
-        'Patna': 1.0,      # Bihar capital
-        'Guwahati': 1.1,   # Gateway to Northeast
-        'Raipur': 0.9,     # Chhattisgarh capital
-        'Dehradun': 1.2,   # Uttarakhand capital, hill station
-        'Jammu': 1.0,      # J&K winter capital
-        'Amritsar': 1.1,   # Golden temple city
-        'Jalandhar': 1.0   # Sports goods hub Punjab
-    }
-    
     data = []
     for i in range(n_samples):
         # Random city selection
-        city = np.random.choice(cities)
-        multiplier = city_price_multipliers[city]
+        city = np.random.choice(CITIES)
+        multiplier = CITY_PRICE_MULTIPLIERS[city]
         
         # Generate realistic house sizes (500 to 3000 sq ft - typical for India)
         size = np.random.normal(1200, 400)
@@ -130,6 +132,36 @@ def generate_realistic_indian_housing_data(n_samples=1000):
     return pd.DataFrame(data)
 
 
+def generate_indian_housing_data_vectorized(n_samples=1000, seed=42):
+    """
+    Generate Indian housing data with the same distributions as
+    generate_realistic_indian_housing_data, drawn as whole arrays.
+
+    Fast enough for millions of rows (used by benchmark.py), but it draws the
+    random numbers in a different order, so the rows differ from the
+    row-by-row generator that produces the shipped model.
+    """
+    rng = np.random.default_rng(seed)
+
+    city_index = rng.integers(0, len(CITIES), n_samples)
+    multiplier = np.array([CITY_PRICE_MULTIPLIERS[city] for city in CITIES])[city_index]
+
+    size = np.clip(rng.normal(1200, 400, n_samples), 500, 3000)
+    bedrooms = np.clip(np.round(size / 400 + rng.normal(0, 0.5, n_samples)), 1, 5).astype(int)
+
+    base_price_per_sqft = np.clip(rng.normal(4000, 800, n_samples) * multiplier, 2000, 20000)
+    bedroom_premium = bedrooms * rng.normal(150000, 30000, n_samples) * multiplier
+    final_price = size * base_price_per_sqft + bedroom_premium + rng.normal(0, 200000, n_samples)
+    final_price = np.clip(final_price, 1000000 * multiplier * 0.5, 30000000 * multiplier)
+
+    return pd.DataFrame({
+        'sizes': size.astype(int),
+        'bedrooms': bedrooms,
+        'city': np.array(CITIES)[city_index],
+        'prices': final_price.astype(int)
+    })
+
+
 def train_and_save_model():
     """Train model with proper dataset, validation, and location parameter"""
     print("🏠 Training Enhanced Indian House Price Prediction Model...")
@@ -190,8 +222,13 @@ def train_and_save_model():
     with open("city_encoder.pkl", "wb") as f:
         pickle.dump(label_encoder, f)
     
+    # Precompute the locality index used for latitude/longitude and locality inputs
+    locality_index = build_locality_index(generate_indian_housing_data_vectorized(200_000))
+    save_locality_index(locality_index, "locality_index.npz")
+
     print("💾 Enhanced Indian housing model saved as 'model.pkl'")
     print("💾 City encoder saved as 'city_encoder.pkl'")
+    print(f"💾 Locality index ({len(locality_index['names'])} localities) saved as 'locality_index.npz'")
     
     # Demonstrate location impact
     print(f"\n🏙️ LOCATION IMPACT DEMO (1200 sq ft, 3 BHK):")